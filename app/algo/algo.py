@@ -10,6 +10,7 @@ import numpy as np
 from matplotlib.widgets import CheckButtons
 from scipy.ndimage import gaussian_filter1d
 
+from app.landmark_filter import create_landmark_filter
 from app.video_source import VideoSource
 
 
@@ -136,7 +137,7 @@ def plot_segments(jumpdata_segments: List[Dict[str, List[JumpData]]]):
 
 
 class JumpForceVelocityTracker:
-    def __init__(self, mass, video_path, model_path):
+    def __init__(self, mass, video_path, model_path, filter_name="savgol"):
         self.mass = mass
         self.video_path = video_path
         self.model_path = model_path
@@ -147,6 +148,7 @@ class JumpForceVelocityTracker:
         self.previous_velocity = 0
         self.previous_force = 0
         self.previous_state = JumpState.UNKNOWN
+        self.landmark_filter = create_landmark_filter(filter_name)
 
         options = mp.tasks.vision.PoseLandmarkerOptions(
             base_options=mp.tasks.BaseOptions(model_asset_path=self.model_path),
@@ -163,6 +165,8 @@ class JumpForceVelocityTracker:
 
         skip_next = False
 
+        positions = []
+        timestamps = []
         with closing(VideoSource(self.video_path)) as video_source:
             for idx, bgr_frame in enumerate(video_source.stream_bgr()):
                 if idx is None:
@@ -175,28 +179,34 @@ class JumpForceVelocityTracker:
                 if landmark_positions_3d is None:
                     continue
 
-                current_time = bgr_frame.time
-                force, velocity, state = self._compute(landmark_positions_3d, current_time)
+                positions.append(landmark_positions_3d)
+                timestamps.append(bgr_frame.time)
 
-                if state not in (JumpState.TAKEOFF, JumpState.LANDING, JumpState.TRANSITION):
-                    continue
+        if positions:
+            positions = self.landmark_filter.filter_offline(np.array(positions), np.array(timestamps))
 
-                if state == JumpState.TRANSITION:
-                    if current_segment[JumpState.TAKEOFF] or current_segment[JumpState.LANDING]:
-                        segments.append(current_segment)
-                    current_segment = {JumpState.TAKEOFF: [], JumpState.LANDING: []}  # Новый сегмент
-                    skip_next = True
-                    continue
+        for landmark_positions_3d, current_time in zip(positions, timestamps):
+            force, velocity, state = self._compute(landmark_positions_3d, current_time)
 
-                if skip_next:
-                    skip_next = False
-                    continue
+            if state not in (JumpState.TAKEOFF, JumpState.LANDING, JumpState.TRANSITION):
+                continue
+
+            if state == JumpState.TRANSITION:
+                if current_segment[JumpState.TAKEOFF] or current_segment[JumpState.LANDING]:
+                    segments.append(current_segment)
+                current_segment = {JumpState.TAKEOFF: [], JumpState.LANDING: []}  # Новый сегмент
+                skip_next = True
+                continue
+
+            if skip_next:
+                skip_next = False
+                continue
 
-                data_entry = JumpData(force=force, velocity=velocity, jump_state=state)
-                if state == JumpState.TAKEOFF:
-                    current_segment[JumpState.TAKEOFF].append(data_entry)
-                elif state == JumpState.LANDING:
-                    current_segment[JumpState.LANDING].append(data_entry)
+            data_entry = JumpData(force=force, velocity=velocity, jump_state=state)
+            if state == JumpState.TAKEOFF:
+                current_segment[JumpState.TAKEOFF].append(data_entry)
+            elif state == JumpState.LANDING:
+                current_segment[JumpState.LANDING].append(data_entry)
 
         if current_segment[JumpState.TAKEOFF] or current_segment[JumpState.LANDING]:
             segments.append(current_segment)
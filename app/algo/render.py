@@ -0,0 +1,196 @@
+import os
+import pickle
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, List, Sequence
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+from scipy.ndimage import gaussian_filter1d
+
+PHASE_COLORS = {"TAKEOFF": "green", "LANDING": "red"}
+
+# Figures are built once per process and cleared between renders.
+_templates: Dict[str, Figure] = {}
+
+
+def _phase(segment, name):
+    # Segment keys may be JumpState members or plain names, so match phases by name.
+    for state, data in segment.items():
+        if getattr(state, "name", state) == name:
+            return data
+    return []
+
+
+class JumpState(Enum):
+    TAKEOFF = 1
+    LANDING = 2
+    UNKNOWN = 3
+    TRANSITION = 4
+
+
+@dataclass
+class JumpData:
+    force: float = 0.0
+    velocity: float = 0.0
+    jump_state: JumpState = JumpState.UNKNOWN
+    timestamp: float = 0.0
+    frame_idx: int = -1
+
+
+class _Placeholder:
+    # Stands in for any other class in a results file (e.g. the app's JumpIndex); reports don't use them.
+    def __setstate__(self, state):
+        self.__dict__.update(state if isinstance(state, dict) else {})
+
+
+class ResultsUnpickler(pickle.Unpickler):
+    # Results are pickled by the app (jump_tracker.*) or by algo.py (__main__.*). Both are loaded into the
+    # stand-ins above, so rendering needs neither module on the path nor mediapipe in every worker.
+    stand_ins = {"JumpState": JumpState, "JumpData": JumpData}
+
+    def find_class(self, module, name):
+        if name in self.stand_ins:
+            return self.stand_ins[name]
+        try:
+            return super().find_class(module, name)
+        except (ImportError, AttributeError):
+            return _Placeholder
+
+
+def load_segments(path):
+    with open(path, 'rb') as file:
+        results = ResultsUnpickler(file).load()
+        if isinstance(results, list):
+            return results
+        if "segments" in results:
+            return results["segments"]
+
+        # Current results files: a header, then one pickle per segment.
+        segments = []
+        while True:
+            try:
+                segments.append(ResultsUnpickler(file).load())
+            except EOFError:
+                return segments
+
+
+def _template(kind) -> Figure:
+    if kind in _templates:
+        fig = _templates[kind]
+        ax = fig.axes[0]
+        for artist in list(ax.lines) + list(ax.collections):
+            artist.remove()
+        if ax.get_legend() is not None:
+            ax.get_legend().remove()
+        # Forget the previous report's limits, even if this one ends up drawing nothing.
+        ax.relim()
+        ax.set_xlim(0, 1)
+        ax.set_ylim(0, 1)
+        ax.set_autoscale_on(True)
+        ax.ignore_existing_data_limits = True
+        return fig
+
+    fig = Figure(figsize=(12, 8))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    ax.set_xlabel("Velocity (m/s)")
+    ax.set_ylabel("Force (N)")
+    ax.grid(True)
+    if kind == "smoothed":
+        ax.set_title("Smoothed Force-Velocity Profile")
+    else:
+        ax.set_title("Force-Velocity Profile for Jump Segments")
+    _templates[kind] = fig
+    return fig
+
+
+def aggregate_phase(segments, name):
+    velocities = np.array([d.velocity for s in segments for d in _phase(s, name)], dtype=float)
+    forces = np.array([d.force for s in segments for d in _phase(s, name)], dtype=float)
+    if len(velocities) == 0:
+        return velocities, forces
+
+    x, inverse = np.unique(velocities, return_inverse=True)
+    y = np.bincount(inverse, weights=forces) / np.bincount(inverse)
+    return x, y
+
+
+def render_smoothed(segments, path, smooth_sigma=2):
+    fig = _template("smoothed")
+    ax = fig.axes[0]
+
+    labels = {"TAKEOFF": ("Takeoff", "Eccentric Phase"), "LANDING": ("Landing", "Concentric Phase")}
+    for name, (line_label, fill_label) in labels.items():
+        x, y = aggregate_phase(segments, name)
+        if len(x) > 1:
+            y_smooth = gaussian_filter1d(y, sigma=smooth_sigma)
+            ax.plot(x, y_smooth, label=line_label, color=PHASE_COLORS[name])
+            ax.fill_between(x, y_smooth, color=PHASE_COLORS[name], alpha=0.2, label=fill_label)
+
+    ax.axvline(color='black', linewidth=2, linestyle='--', label="Transition Point (Zero Velocity)")
+    ax.legend()
+    ax.relim()
+    ax.autoscale_view()
+    fig.tight_layout()
+    fig.savefig(path)
+
+
+def render_segments(segments, path):
+    fig = _template("segments")
+    ax = fig.axes[0]
+
+    # One collection per phase instead of one Line2D per segment.
+    for name, color in PHASE_COLORS.items():
+        lines = [
+            np.array([(d.velocity, d.force) for d in _phase(segment, name)], dtype=float)
+            for segment in segments
+        ]
+        lines = [line for line in lines if len(line) > 1]
+        if lines:
+            ax.add_collection(LineCollection(lines, colors=color, linewidths=1))
+
+    # Collections carry no per-line labels, so the legend uses stand-in handles.
+    ax.legend(handles=[
+        Line2D([], [], color=PHASE_COLORS["TAKEOFF"], label="Takeoff"),
+        Line2D([], [], color=PHASE_COLORS["LANDING"], label="Landing"),
+    ])
+
+    ax.autoscale_view()
+    fig.tight_layout()
+    fig.savefig(path)
+
+
+def render_report(results_path, output_dir, formats: Sequence[str] = ("png",)) -> List[str]:
+    segments = load_segments(results_path)
+    name = os.path.splitext(os.path.basename(results_path))[0]
+    os.makedirs(output_dir, exist_ok=True)
+
+    written = []
+    for extension in formats:
+        smoothed_path = os.path.join(output_dir, f"{name}_smoothed.{extension}")
+        segments_path = os.path.join(output_dir, f"{name}_segments.{extension}")
+        render_smoothed(segments, smoothed_path)
+        render_segments(segments, segments_path)
+        written.extend([smoothed_path, segments_path])
+    return written
+
+
+def render_reports(results_paths, output_dir, formats: Sequence[str] = ("png",), processes=None) -> List[str]:
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = [
+            executor.submit(render_report, results_path, output_dir, tuple(formats))
+            for results_path in results_paths
+        ]
+        return [path for future in futures for path in future.result()]
+
+
+if __name__ == "__main__":
+    output = sys.argv[1]
+    for report_path in render_reports(sys.argv[2:], output, formats=("png", "svg", "pdf")):
+        print(report_path)
@@ -0,0 +1,132 @@
+import logging
+import os
+import subprocess
+import sys
+import threading
+from collections import deque
+from contextlib import closing
+from typing import Dict, Optional
+
+import cv2
+
+from video_source import VideoSource, timestamps_path_for
+
+
+def proxy_path_for(video_path):
+    return f"{video_path}.proxy.avi"
+
+
+def proxy_for(video_path) -> Optional[str]:
+    # A proxy only counts once it has been renamed into place and is newer than its source.
+    proxy_path = proxy_path_for(video_path)
+    if not os.path.exists(proxy_path) or not os.path.exists(timestamps_path_for(proxy_path)):
+        return None
+    if os.path.getmtime(proxy_path) < os.path.getmtime(video_path):
+        return None
+    return proxy_path
+
+
+def analysis_path_for(video_path):
+    return proxy_for(video_path) or video_path
+
+
+def _remove_temporary(proxy_path):
+    temporary_path = f"{proxy_path}.tmp.avi"
+    for path in (temporary_path, timestamps_path_for(temporary_path)):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def make_proxy(video_path, height=480):
+    proxy_path = proxy_path_for(video_path)
+    temporary_path = f"{proxy_path}.tmp.avi"
+
+    # Written synchronously: offline, a writer thread would let decoding run ahead and buffer frames without bound.
+    video_writer = None
+    try:
+        with closing(VideoSource(video_path)) as video_source, \
+                open(timestamps_path_for(temporary_path), 'w') as timestamps:
+            for frame in video_source.stream_bgr():
+                source_height, source_width = frame.data.shape[:2]
+                if source_height > height:
+                    width = int(round(source_width * height / source_height / 2)) * 2
+                    data = cv2.resize(frame.data, (width, height), interpolation=cv2.INTER_AREA)
+                else:
+                    data = frame.data
+
+                if video_writer is None:
+                    # MJPG is all-intra and cheap to decode; the sidecar keeps the source's frame times.
+                    video_writer = cv2.VideoWriter(
+                        temporary_path, cv2.VideoWriter_fourcc(*"MJPG"), 30.0, (data.shape[1], data.shape[0])
+                    )
+                video_writer.write(data)
+                timestamps.write(f"{frame.time!r}\n")
+    except BaseException:
+        if video_writer is not None:
+            video_writer.release()
+        _remove_temporary(proxy_path)
+        raise
+
+    if video_writer is None:
+        _remove_temporary(proxy_path)
+        raise ValueError(f"No frames could be read from {video_path}")
+    video_writer.release()
+    os.replace(timestamps_path_for(temporary_path), timestamps_path_for(proxy_path))
+    os.replace(temporary_path, proxy_path)
+    return proxy_path
+
+
+class ProxyIngest:
+    def __init__(self, processes=1):
+        self.processes = processes
+        self.lock = threading.Lock()
+        self.waiting = deque()
+        self.running: Dict[str, subprocess.Popen] = {}
+        self.closed = False
+
+    def submit(self, video_path) -> bool:
+        if proxy_for(video_path) is not None:
+            return False
+        with self.lock:
+            if video_path not in self.running and video_path not in self.waiting:
+                self.waiting.append(video_path)
+            self._start_waiting()
+        return True
+
+    def _start_waiting(self):
+        # Each proxy is built by running this file as a script, so the worker loads only cv2 and
+        # video_source; a multiprocessing worker would re-import the GUI and mediapipe from main.py.
+        while self.waiting and len(self.running) < self.processes and not self.closed:
+            video_path = self.waiting.popleft()
+            process = subprocess.Popen(
+                [sys.executable, os.path.abspath(__file__), video_path],
+                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+            )
+            self.running[video_path] = process
+            threading.Thread(target=self._wait, args=(video_path, process), daemon=True).start()
+
+    def _wait(self, video_path, process: subprocess.Popen):
+        _, errors = process.communicate()
+        with self.lock:
+            self.running.pop(video_path, None)
+            if process.returncode != 0 and not self.closed:
+                # The worker's traceback ends with the exception message.
+                message = errors.strip().splitlines()[-1] if errors.strip() else f"exit code {process.returncode}"
+                logging.error("Couldn't build analysis proxy for %s: %s", video_path, message)
+            self._start_waiting()
+
+    def shutdown(self):
+        # Unfinished proxies are abandoned; they are rebuilt the next time their video is picked.
+        with self.lock:
+            self.closed = True
+            self.waiting.clear()
+            running = dict(self.running)
+        for video_path, process in running.items():
+            process.terminate()
+            process.wait()
+            _remove_temporary(proxy_path_for(video_path))
+
+
+if __name__ == "__main__":
+    for path in sys.argv[1:]:
+        print(make_proxy(path))
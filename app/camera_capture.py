@@ -0,0 +1,61 @@
+import threading
+import time
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+class CameraCapture:
+    def __init__(self, camera_index, recorder=None):
+        self.capture = cv2.VideoCapture(camera_index)
+        self.recorder = recorder
+        self.available = self.capture.isOpened()
+        self.captured = 0
+
+        self.start_time = None
+        self.running = False
+        self.thread = None
+        self.lock = threading.Lock()
+        # (frame, timestamp, frame_idx); frame_idx counts every captured frame, i.e. its index in the recording.
+        self.latest: Optional[Tuple[np.ndarray, float, int]] = None
+
+    def start(self, start_time):
+        self.start_time = start_time
+        self.running = True
+        self.thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join()
+        self.capture.release()
+
+    def latest_frame(self) -> Optional[Tuple[np.ndarray, float, int]]:
+        # Inference only ever wants the newest frame; None means nothing new since the last call.
+        with self.lock:
+            latest, self.latest = self.latest, None
+        return latest
+
+    def _capture_loop(self):
+        while self.running:
+            # grab() returns as soon as the frame is in, so the timestamp isn't skewed by decoding.
+            if not self.capture.grab():
+                self.available = False
+                time.sleep(0.01)
+                continue
+            timestamp = time.monotonic() - self.start_time
+
+            ret, frame = self.capture.retrieve()
+            if not ret:
+                continue
+            self.available = True
+            frame_idx = self.captured
+            self.captured += 1
+
+            # Every frame is recorded here, independent of how fast inference keeps up.
+            if self.recorder is not None:
+                self.recorder.write(frame, timestamp)
+            with self.lock:
+                self.latest = (frame, timestamp, frame_idx)
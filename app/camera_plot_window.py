@@ -4,13 +4,20 @@ import time
 
 from PyQt6.QtGui import QIcon
 
-from jump_tracker import JumpData, JumpState, CameraJumpForceVelocityTracker
+from camera_capture import CameraCapture
+from fv_profile import ForceVelocityProfile
+from jump_index import JumpIndexBuilder
+from jump_tracker import JumpData, JumpState, CameraJumpForceVelocityTracker, JumpSegmenter
 from mlp_canvas import MplCanvas
+from results import save_session
+from session_recorder import SessionRecorder
+from session_store import SessionStore
 
 class CameraPlotWindow(QtWidgets.QMainWindow):
     return_to_main_signal = QtCore.pyqtSignal()
 
-    def __init__(self, mass):
+    def __init__(self, mass, camera_index=0, results_server=None, record_path=None, results_path=None,
+                 athlete="", catalog=None):
         super().__init__()
         self.setWindowTitle("Force-Velocity Profiling")
         self.setGeometry(100, 100, 1000, 800)
@@ -41,12 +48,20 @@ class CameraPlotWindow(QtWidgets.QMainWindow):
         self.return_button.clicked.connect(self.return_to_main)
         self.layout.addWidget(self.return_button)
 
-        self.cap = cv2.VideoCapture(0)
         self.tracker = CameraJumpForceVelocityTracker(mass=mass)
-
-        self.segments = []
-        self.current_segment = {JumpState.TAKEOFF: [], JumpState.LANDING: []}
-        self.skip_next = False
+        self.results_server = results_server
+        self.recorder = SessionRecorder(record_path) if record_path else None
+        self.camera = CameraCapture(camera_index, self.recorder)
+        self.mass = mass
+        self.record_path = record_path
+        self.results_path = results_path
+        self.athlete = athlete
+        self.catalog = catalog
+
+        self.store = SessionStore()
+        self.segmenter = JumpSegmenter(self.store)
+        self.profile = ForceVelocityProfile()
+        self.jump_index_builder = JumpIndexBuilder()
         self.countdown = 5
 
         self.countdown_timer = QtCore.QTimer(self)
@@ -68,23 +83,28 @@ class CameraPlotWindow(QtWidgets.QMainWindow):
             self.countdown_timer.stop()
             self.timer_label.hide()
             self.graph_canvas.setVisible(True)
-            self.start_time = time.time()
+            self.start_time = time.monotonic()
+            self.camera.start(self.start_time)
             self.timer.start(30)
             self.graph_update_timer.start(10000)
 
     def update_frame(self):
-        ret, frame = self.cap.read()
-        if not ret:
-            self.status_label.setText("Status: Camera not available")
+        latest = self.camera.latest_frame()
+        if latest is None:
+            if not self.camera.available:
+                self.status_label.setText("Status: Camera not available")
             return
 
-        timestamp = time.time() - self.start_time
-        data = self.tracker.update_for_camera(frame, timestamp)
+        frame, timestamp, frame_idx = latest
+        data = self.tracker.update_for_camera(frame, timestamp, frame_idx)
 
         if data:
             self.on_new_data(data)
+            if self.results_server is not None:
+                self.results_server.publish(data)
             self.status_label.setText(
-                f"Force: {data.force:.2f}, Velocity: {data.velocity:.2f}, State: {data.jump_state.name}"
+                f"Force: {data.force:.2f}, Velocity: {data.velocity:.2f}, State: {data.jump_state.name}, "
+                f"Jumps: {len(self.jump_index_builder.index)}, {self.profile_summary()}"
             )
         rgb_image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         height, width, channel = rgb_image.shape
@@ -94,29 +114,36 @@ class CameraPlotWindow(QtWidgets.QMainWindow):
         self.video_label.setPixmap(pixmap)
 
     def on_new_data(self, data: JumpData):
-        if data.jump_state == JumpState.TRANSITION:
-            if self.current_segment[JumpState.TAKEOFF] or self.current_segment[JumpState.LANDING]:
-                self.segments.append(self.current_segment)
-                self.current_segment = {JumpState.TAKEOFF: [], JumpState.LANDING: []}
-            self.skip_next = True
-            return
+        self.jump_index_builder.add(data)
+        if self.segmenter.add(data):
+            self.profile.add(data, len(self.segmenter.segments))
 
-        if self.skip_next:
-            self.skip_next = False
-            return
-
-        if data.jump_state == JumpState.TAKEOFF:
-            self.current_segment[JumpState.TAKEOFF].append(data)
-        elif data.jump_state == JumpState.LANDING:
-            self.current_segment[JumpState.LANDING].append(data)
+    def profile_summary(self):
+        fit = self.profile.fit(JumpState.TAKEOFF)
+        if fit is None or fit.v0 is None:
+            return "F0: -, V0: -, Pmax: -"
+        return f"F0: {fit.f0:.0f} N, V0: {fit.v0:.2f} m/s, Pmax: {fit.pmax:.0f} W"
 
     def update_graph(self):
-        segments_to_display = self.segments.copy()
-        self.graph_canvas.update_plot(segments_to_display)
+        self.graph_canvas.update_plot_from_bins(self.store.bins)
 
     def return_to_main(self):
         self.timer.stop()
         self.graph_update_timer.stop()
-        self.cap.release()
+        self.camera.stop()
+        if self.recorder is not None:
+            self.recorder.close()
+        # The full history, spilled part included, is exported before the spill log goes away.
+        if self.results_path is not None:
+            current_segment = self.segmenter.current_segment
+            if current_segment[JumpState.TAKEOFF] or current_segment[JumpState.LANDING]:
+                self.store.append(current_segment)
+            # Unrecorded sessions, or recordings that never got a frame, are catalogued without a video.
+            video_path = self.record_path if self.recorder is not None and self.recorder.written else None
+            save_session(
+                video_path, self.store, self.jump_index_builder.index, self.profile, self.athlete,
+                self.mass, self.catalog, results_path=self.results_path,
+            )
+        self.store.close()
         self.close()
         self.return_to_main_signal.emit()
\ No newline at end of file
@@ -0,0 +1,194 @@
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+import cv2
+
+from fv_profile import ForceVelocityProfile
+from jump_index import JumpIndexBuilder
+from jump_tracker import CameraJumpForceVelocityTracker, JumpData, JumpSegmenter, JumpState
+from results import save_session
+from session_store import SessionStore
+
+
+def parse_camera_streams(text) -> List[Tuple[int, float, str]]:
+    # "0:70:Иванов, 1:82.5" -> [(0, 70.0, "Иванов"), (1, 82.5, "")]
+    streams = []
+    for item in text.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        parts = [part.strip() for part in item.split(":", 2)]
+        if len(parts) < 2 or not parts[0].isdigit():
+            raise ValueError(f"Неверный формат камеры: {item} (ожидается индекс:масса[:спортсмен])")
+        camera_index, mass = int(parts[0]), float(parts[1])
+        if mass <= 0:
+            raise ValueError("Масса должна быть положительным числом.")
+        if any(camera_index == stream[0] for stream in streams):
+            raise ValueError(f"Камера {camera_index} указана несколько раз.")
+        streams.append((camera_index, mass, parts[2] if len(parts) > 2 else ""))
+    return streams
+
+
+@dataclass
+class StreamStats:
+    captured: int = 0
+    processed: int = 0
+    dropped: int = 0
+    total_latency: float = 0.0
+    last_latency: float = 0.0
+    started_at: float = field(default_factory=time.monotonic)
+
+    def report(self):
+        elapsed = max(time.monotonic() - self.started_at, 1e-6)
+        return {
+            "captured": self.captured,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "throughput_fps": self.processed / elapsed,
+            "mean_latency": self.total_latency / self.processed if self.processed else 0.0,
+            "last_latency": self.last_latency,
+        }
+
+
+class CameraStream:
+    def __init__(self, stream_id, camera_index, mass, athlete=""):
+        self.stream_id = stream_id
+        self.camera_index = camera_index
+        self.mass = mass
+        self.athlete = athlete
+        self.tracker = CameraJumpForceVelocityTracker(mass=mass)
+        self.store = SessionStore()
+        self.segmenter = JumpSegmenter(self.store)
+        self.profile = ForceVelocityProfile()
+        self.jump_index_builder = JumpIndexBuilder()
+        self.stats = StreamStats()
+
+        self.capture = None
+        self.start_time = None
+        self.lock = threading.Lock()
+        # Only the newest frame is kept; an unprocessed older frame counts as dropped.
+        self.pending_frame = None
+        self.scheduled = False
+
+    def add(self, data: JumpData):
+        self.jump_index_builder.add(data)
+        if self.segmenter.add(data):
+            self.profile.add(data, len(self.segmenter.segments))
+
+    def save(self, results_path, catalog=None):
+        # Same export as a single-camera session: results file, catalogue entry, then the spill log goes.
+        current_segment = self.segmenter.current_segment
+        if current_segment[JumpState.TAKEOFF] or current_segment[JumpState.LANDING]:
+            self.store.append(current_segment)
+        save_session(
+            None, self.store, self.jump_index_builder.index, self.profile, self.athlete, self.mass, catalog,
+            results_path=results_path,
+        )
+        self.store.close()
+
+
+class CameraScheduler:
+    def __init__(self, workers=None, on_data: Optional[Callable[[str, JumpData], None]] = None):
+        self.workers = workers
+        self.on_data = on_data
+        self.streams: Dict[str, CameraStream] = {}
+        self.ready = queue.Queue()
+        self.running = False
+        self.threads: List[threading.Thread] = []
+
+    def add_stream(self, stream_id, camera_index, mass, athlete="") -> CameraStream:
+        if self.running:
+            raise RuntimeError("Streams must be added before the scheduler is started.")
+        if stream_id in self.streams:
+            raise ValueError(f"Stream {stream_id} already exists.")
+        stream = CameraStream(stream_id, camera_index, mass, athlete)
+        self.streams[stream_id] = stream
+        return stream
+
+    def start(self):
+        self.running = True
+        worker_count = self.workers or len(self.streams)
+
+        for stream in self.streams.values():
+            stream.capture = cv2.VideoCapture(stream.camera_index)
+            if not stream.capture.isOpened():
+                logging.error("Couldn't open camera %s for stream %s", stream.camera_index, stream.stream_id)
+            stream.start_time = time.monotonic()
+            stream.stats = StreamStats()
+            self.threads.append(threading.Thread(target=self._capture_loop, args=(stream,), daemon=True))
+
+        for _ in range(worker_count):
+            self.threads.append(threading.Thread(target=self._worker_loop, daemon=True))
+
+        for thread in self.threads:
+            thread.start()
+
+    def stop(self):
+        self.running = False
+        for _ in range(len(self.threads)):
+            self.ready.put(None)
+        for thread in self.threads:
+            thread.join()
+        self.threads = []
+
+        for stream in self.streams.values():
+            if stream.capture is not None:
+                stream.capture.release()
+
+    def stats(self):
+        return {stream_id: stream.stats.report() for stream_id, stream in self.streams.items()}
+
+    def segments(self, stream_id):
+        return self.streams[stream_id].segmenter.segments
+
+    def _capture_loop(self, stream: CameraStream):
+        while self.running:
+            if not stream.capture.grab():
+                time.sleep(0.01)
+                continue
+            # Timestamp at grab time, before decoding.
+            captured_at = time.monotonic()
+            ret, frame = stream.capture.retrieve()
+            if not ret:
+                continue
+
+            with stream.lock:
+                frame_idx = stream.stats.captured
+                stream.stats.captured += 1
+                if stream.pending_frame is not None:
+                    stream.stats.dropped += 1
+                stream.pending_frame = (frame, captured_at, frame_idx)
+                # A stream sits in the ready queue at most once, so each gets a fair turn.
+                if not stream.scheduled:
+                    stream.scheduled = True
+                    self.ready.put(stream)
+
+    def _worker_loop(self):
+        while self.running:
+            stream = self.ready.get()
+            if stream is None:
+                break
+
+            with stream.lock:
+                frame, captured_at, frame_idx = stream.pending_frame
+                stream.pending_frame = None
+
+            data = stream.tracker.update_for_camera(frame, captured_at - stream.start_time, frame_idx)
+            if data:
+                stream.add(data)
+                if self.on_data is not None:
+                    self.on_data(stream.stream_id, data)
+
+            latency = time.monotonic() - captured_at
+            with stream.lock:
+                stream.stats.processed += 1
+                stream.stats.total_latency += latency
+                stream.stats.last_latency = latency
+                if stream.pending_frame is not None:
+                    self.ready.put(stream)
+                else:
+                    stream.scheduled = False
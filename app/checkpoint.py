@@ -0,0 +1,71 @@
+import logging
+import os
+import pickle
+import threading
+
+# Bump whenever the tracker state or the partial results change shape; older checkpoints are then ignored.
+CHECKPOINT_VERSION = 3
+
+
+def checkpoint_path_for(video_path):
+    return f"{video_path}.checkpoint.pkl"
+
+
+def _video_signature(video_path):
+    stat = os.stat(video_path)
+    return stat.st_size, stat.st_mtime
+
+
+def dump_checkpoint(video_path, frame_idx, tracker_state, partial_results) -> bytes:
+    return pickle.dumps({
+        "version": CHECKPOINT_VERSION,
+        "video_signature": _video_signature(video_path),
+        "frame_idx": frame_idx,
+        "tracker": tracker_state,
+        "results": partial_results,
+    })
+
+
+def write_checkpoint(video_path, payload: bytes):
+    path = checkpoint_path_for(video_path)
+    temporary_path = f"{path}.tmp"
+    # Write to a side file and rename, so a crash mid-write keeps the previous checkpoint.
+    with open(temporary_path, 'wb') as file:
+        file.write(payload)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary_path, path)
+
+
+def write_checkpoint_async(video_path, payload: bytes) -> threading.Thread:
+    thread = threading.Thread(target=write_checkpoint, args=(video_path, payload), daemon=True)
+    thread.start()
+    return thread
+
+
+def load_checkpoint(video_path):
+    path = checkpoint_path_for(video_path)
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with open(path, 'rb') as file:
+            checkpoint = pickle.load(file)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        logging.warning("Ignoring unreadable checkpoint %s", path)
+        return None
+
+    if not isinstance(checkpoint, dict) or checkpoint.get("version") != CHECKPOINT_VERSION:
+        logging.warning("Ignoring checkpoint %s written by an older version", path)
+        return None
+
+    if checkpoint.get("video_signature") != _video_signature(video_path):
+        logging.warning("Ignoring checkpoint %s, the video has changed", path)
+        return None
+    return checkpoint
+
+
+def remove_checkpoint(video_path):
+    path = checkpoint_path_for(video_path)
+    if os.path.exists(path):
+        os.remove(path)
@@ -0,0 +1,122 @@
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from jump_tracker import JumpData, JumpState
+
+
+@dataclass
+class LinearFit:
+    f0: float
+    v0: Optional[float]
+    slope: float
+    pmax: Optional[float]
+    samples: int
+
+
+class OnlineLinearFit:
+    # Huber tuning constant; residuals beyond it (in units of the running scale) are down-weighted.
+    huber_k = 1.345
+
+    def __init__(self):
+        self.count = 0
+        self.weight = 0.0
+        self.sum_x = 0.0
+        self.sum_y = 0.0
+        self.sum_xx = 0.0
+        self.sum_xy = 0.0
+        self.sum_abs_residual = 0.0
+        self.residual_weight = 0.0
+
+    def _huber_weight(self, residual):
+        if self.count < 5 or self.residual_weight <= 0:
+            return 1.0
+
+        # Mean absolute residual scaled to a normal standard deviation.
+        scale = 1.25 * self.sum_abs_residual / self.residual_weight
+        if scale <= 0 or residual <= self.huber_k * scale:
+            return 1.0
+        return self.huber_k * scale / residual
+
+    def add(self, x, y):
+        x = float(x)
+        y = float(y)
+        weight = 1.0
+
+        fit = self.fit()
+        if fit is not None:
+            residual = abs(y - (fit.f0 + fit.slope * x))
+            weight = self._huber_weight(residual)
+            self.sum_abs_residual += weight * residual
+            self.residual_weight += weight
+
+        self.count += 1
+        self.weight += weight
+        self.sum_x += weight * x
+        self.sum_y += weight * y
+        self.sum_xx += weight * x * x
+        self.sum_xy += weight * x * y
+
+    def merge(self, other: "OnlineLinearFit") -> "OnlineLinearFit":
+        merged = OnlineLinearFit()
+        for name in vars(merged):
+            setattr(merged, name, getattr(self, name) + getattr(other, name))
+        return merged
+
+    def fit(self) -> Optional[LinearFit]:
+        if self.count < 2:
+            return None
+
+        denominator = self.weight * self.sum_xx - self.sum_x ** 2
+        if abs(denominator) < 1e-12:
+            return None
+
+        slope = (self.weight * self.sum_xy - self.sum_x * self.sum_y) / denominator
+        f0 = (self.sum_y - slope * self.sum_x) / self.weight
+
+        # V0 and Pmax only exist for the usual profile where force drops as velocity grows.
+        if slope < 0 < f0:
+            v0 = -f0 / slope
+            pmax = f0 * v0 / 4
+        else:
+            v0 = None
+            pmax = None
+
+        return LinearFit(f0=f0, v0=v0, slope=slope, pmax=pmax, samples=self.count)
+
+
+def _phase_fits():
+    return {JumpState.TAKEOFF: OnlineLinearFit(), JumpState.LANDING: OnlineLinearFit()}
+
+
+class ForceVelocityProfile:
+    def __init__(self):
+        self.phases = _phase_fits()
+        self.segments: Dict[int, Dict[JumpState, OnlineLinearFit]] = {}
+
+    def add(self, data: JumpData, segment_idx):
+        # Velocity magnitude, so both phases follow the force-drops-with-speed convention.
+        velocity = abs(data.velocity)
+        self.phases[data.jump_state].add(velocity, data.force)
+        self.segments.setdefault(segment_idx, _phase_fits())[data.jump_state].add(velocity, data.force)
+
+    def merge(self, other: "ForceVelocityProfile") -> "ForceVelocityProfile":
+        merged = ForceVelocityProfile()
+        for state in merged.phases:
+            merged.phases[state] = self.phases[state].merge(other.phases[state])
+
+        for segment_idx in self.segments.keys() | other.segments.keys():
+            fits = _phase_fits()
+            for source in (self.segments, other.segments):
+                if segment_idx in source:
+                    for state in fits:
+                        fits[state] = fits[state].merge(source[segment_idx][state])
+            merged.segments[segment_idx] = fits
+        return merged
+
+    def fit(self, state: JumpState) -> Optional[LinearFit]:
+        return self.phases[state].fit()
+
+    def segment_fit(self, segment_idx, state: JumpState) -> Optional[LinearFit]:
+        if segment_idx not in self.segments:
+            return None
+        return self.segments[segment_idx][state].fit()
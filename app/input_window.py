@@ -3,9 +3,13 @@ from PyQt6.QtGui import QIcon
 
 from PyQt6.QtWidgets import QFileDialog, QMessageBox
 
+from camera_scheduler import parse_camera_streams
+
 
 class InputWindow(QtWidgets.QWidget):
-    start_analysis_signal = QtCore.pyqtSignal(float, str, str)
+    start_analysis_signal = QtCore.pyqtSignal(float, str, str, bool, str)
+    video_selected_signal = QtCore.pyqtSignal(str)
+    start_multi_camera_signal = QtCore.pyqtSignal(list)
 
     def __init__(self):
         super().__init__()
@@ -24,6 +28,10 @@ class InputWindow(QtWidgets.QWidget):
         self.mass_input = QtWidgets.QLineEdit()
         self.mass_input.setFixedWidth(200)
 
+        self.athlete_label = QtWidgets.QLabel("Спортсмен:")
+        self.athlete_input = QtWidgets.QLineEdit()
+        self.athlete_input.setFixedWidth(200)
+
         self.video_source_group = QtWidgets.QGroupBox("Выберите источник видео:")
         self.video_source_layout = QtWidgets.QVBoxLayout()
 
@@ -31,8 +39,17 @@ class InputWindow(QtWidgets.QWidget):
         self.file_radio.setChecked(True)
         self.camera_radio = QtWidgets.QRadioButton("Использовать камеру")
 
+        self.record_checkbox = QtWidgets.QCheckBox("Записывать сессию")
+        self.record_checkbox.setVisible(False)
+
+        self.cameras_input = QtWidgets.QLineEdit()
+        self.cameras_input.setPlaceholderText("Несколько камер: индекс:масса[:спортсмен], напр. 0:70:Иванов, 1:82")
+        self.cameras_input.setVisible(False)
+
         self.video_source_layout.addWidget(self.file_radio)
         self.video_source_layout.addWidget(self.camera_radio)
+        self.video_source_layout.addWidget(self.record_checkbox)
+        self.video_source_layout.addWidget(self.cameras_input)
         self.video_source_group.setLayout(self.video_source_layout)
 
         self.file_select_button = QtWidgets.QPushButton("Выбрать видеофайл")
@@ -51,6 +68,8 @@ class InputWindow(QtWidgets.QWidget):
         form_layout.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
         form_layout.addWidget(self.mass_label)
         form_layout.addWidget(self.mass_input)
+        form_layout.addWidget(self.athlete_label)
+        form_layout.addWidget(self.athlete_input)
         form_layout.addWidget(self.video_source_group)
         form_layout.addWidget(self.file_select_button)
         form_layout.addWidget(self.selected_file_label)
@@ -67,9 +86,13 @@ class InputWindow(QtWidgets.QWidget):
         if self.file_radio.isChecked():
             self.file_select_button.setVisible(True)
             self.selected_file_label.setVisible(True)
+            self.record_checkbox.setVisible(False)
+            self.cameras_input.setVisible(False)
         else:
             self.file_select_button.setVisible(False)
             self.selected_file_label.setVisible(False)
+            self.record_checkbox.setVisible(True)
+            self.cameras_input.setVisible(True)
             self.video_file_path = None
             self.selected_file_label.setText("Выбранный файл: Не выбран")
 
@@ -83,22 +106,31 @@ class InputWindow(QtWidgets.QWidget):
         if file_path:
             self.video_file_path = file_path
             self.selected_file_label.setText(f"Выбранный файл: {file_path}")
+            self.video_selected_signal.emit(file_path)
         else:
             self.selected_file_label.setText("Выбранный файл: Не выбран")
 
     def start_analysis(self):
         try:
+            # Each camera carries its own mass, so the single-athlete field isn't needed here.
+            if self.camera_radio.isChecked() and self.cameras_input.text().strip():
+                self.start_multi_camera_signal.emit(parse_camera_streams(self.cameras_input.text()))
+                return
+
             mass = float(self.mass_input.text())
             if mass <= 0:
                 raise ValueError("Масса должна быть положительным числом.")
 
+            record = False
             if not self.file_radio.isChecked() and self.camera_radio.isChecked():
                 video_source = "0"
+                record = self.record_checkbox.isChecked()
             else:
                 video_source = self.video_file_path
 
             model_path = "../model/heavy.task"
-            self.start_analysis_signal.emit(mass, video_source, model_path)
+            athlete = self.athlete_input.text().strip()
+            self.start_analysis_signal.emit(mass, video_source, model_path, record, athlete)
 
         except ValueError as e:
             QMessageBox.critical(self, "Ошибка", str(e))
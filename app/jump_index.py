@@ -0,0 +1,101 @@
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from jump_tracker import JumpData, JumpState
+
+
+@dataclass
+class JumpRecord:
+    number: int
+    start_frame: int
+    end_frame: int
+    takeoff_time: float
+    landing_time: float
+    flight_time: float
+    peak_force: float
+    peak_velocity: float
+
+
+@dataclass
+class JumpIndex:
+    records: List[JumpRecord] = field(default_factory=list)
+
+    def __len__(self):
+        return len(self.records)
+
+    def jump(self, number) -> Optional[JumpRecord]:
+        if 1 <= number <= len(self.records):
+            return self.records[number - 1]
+        return None
+
+    def jump_at(self, timestamp) -> Optional[JumpRecord]:
+        position = bisect_right(self.records, timestamp, key=lambda record: record.takeoff_time) - 1
+        if position < 0:
+            return None
+        return self.records[position]
+
+    def summary(self):
+        if not self.records:
+            return {"jumps": 0}
+        return {
+            "jumps": len(self.records),
+            "mean_flight_time": sum(r.flight_time for r in self.records) / len(self.records),
+            "best_flight_time": max(r.flight_time for r in self.records),
+            "peak_force": max(r.peak_force for r in self.records),
+            "peak_velocity": max(r.peak_velocity for r in self.records),
+        }
+
+
+class JumpIndexBuilder:
+    def __init__(self, min_flight_time=0.1):
+        # Shorter "flights" are jitter in the ground-change heuristic (often a single TRANSITION frame);
+        # a real jump stays airborne for well over 0.1 s.
+        self.min_flight_time = min_flight_time
+        self.index = JumpIndex()
+        self.in_flight = False
+        self.takeoff_time = None
+        self._reset_contact(start_frame=None)
+
+    def _reset_contact(self, start_frame):
+        self.start_frame = start_frame
+        self.peak_force = 0.0
+        self.peak_velocity = 0.0
+
+    def add(self, data: JumpData) -> Optional[JumpRecord]:
+        if data.jump_state == JumpState.TRANSITION:
+            if not self.in_flight:
+                self.in_flight = True
+                self.takeoff_time = data.timestamp
+            return None
+
+        if not self.in_flight:
+            if self.start_frame is None:
+                self.start_frame = data.frame_idx
+            if data.jump_state == JumpState.TAKEOFF:
+                self.peak_force = max(self.peak_force, float(data.force))
+                self.peak_velocity = max(self.peak_velocity, float(data.velocity))
+            return None
+
+        # First grounded sample after a flight closes the jump.
+        self.in_flight = False
+        if data.timestamp - self.takeoff_time < self.min_flight_time:
+            # Not a jump: the contact phase simply continues.
+            if data.jump_state == JumpState.TAKEOFF:
+                self.peak_force = max(self.peak_force, float(data.force))
+                self.peak_velocity = max(self.peak_velocity, float(data.velocity))
+            return None
+
+        record = JumpRecord(
+            number=len(self.index.records) + 1,
+            start_frame=self.start_frame if self.start_frame is not None else data.frame_idx,
+            end_frame=data.frame_idx,
+            takeoff_time=self.takeoff_time,
+            landing_time=data.timestamp,
+            flight_time=data.timestamp - self.takeoff_time,
+            peak_force=self.peak_force,
+            peak_velocity=self.peak_velocity,
+        )
+        self.index.records.append(record)
+        self._reset_contact(start_frame=data.frame_idx)
+        return record
@@ -1,3 +1,4 @@
+from collections import deque
 from dataclasses import dataclass
 from enum import Enum
 
@@ -5,6 +6,9 @@ import cv2
 import mediapipe as mp
 import numpy as np
 
+from analysis_proxy import analysis_path_for
+from landmark_filter import create_landmark_filter
+from motion_gate import MotionGate
 from video_source import VideoSource
 
 class JumpState(Enum):
@@ -20,6 +24,32 @@ class JumpData:
     velocity: int
     jump_state: JumpState
     timestamp: float
+    frame_idx: int = -1
+
+class JumpSegmenter:
+    def __init__(self, segments=None):
+        # Any list-like sink with append(), e.g. a SessionStore that spills old segments to disk.
+        self.segments = [] if segments is None else segments
+        self.current_segment = {JumpState.TAKEOFF: [], JumpState.LANDING: []}
+        self.skip_next = False
+
+    def add(self, data: JumpData) -> bool:
+        if data.jump_state == JumpState.TRANSITION:
+            if self.current_segment[JumpState.TAKEOFF] or self.current_segment[JumpState.LANDING]:
+                self.segments.append(self.current_segment)
+                self.current_segment = {JumpState.TAKEOFF: [], JumpState.LANDING: []}
+            self.skip_next = True
+            return False
+
+        if self.skip_next:
+            self.skip_next = False
+            return False
+
+        if data.jump_state in (JumpState.TAKEOFF, JumpState.LANDING):
+            self.current_segment[data.jump_state].append(data)
+            return True
+        return False
+
 
 def camera_read_landmark_positions_3d(results):
     if not results or not results.pose_landmarks:
@@ -39,7 +69,8 @@ def read_landmark_positions_3d(results):
 
 
 class JumpForceVelocityTracker:
-    def __init__(self, mass, video_path, model_path):
+    def __init__(self, mass, video_path, model_path, filter_name="savgol", latency_budget=None,
+                 motion_gating=True):
 
         self.mass = mass
         self.video_path = video_path
@@ -52,6 +83,20 @@ class JumpForceVelocityTracker:
         self.previous_force = 0
         self.previous_state = JumpState.UNKNOWN
         self.array = []
+        self.landmark_filter = create_landmark_filter(filter_name, latency_budget=latency_budget)
+        # Frame indices of the samples still buffered in the filter's lookahead window.
+        self.filter_frames = deque(maxlen=self.landmark_filter.lookahead + 1)
+        self.next_frame_idx = 0
+        self.motion_gate = MotionGate() if motion_gating else None
+        # Frames released by the motion gate that still await pose inference.
+        # A None entry marks where the gate's frame rate changes and the filter has to restart.
+        self.pending_frames = deque()
+        # Filtered (positions, timestamp, frame_idx) samples waiting for _compute.
+        self.ready_samples = deque()
+        self.stream_ended = False
+        # After a resume, frames before next_frame_idx are re-read and put back where the checkpoint had them.
+        self.replay_frames = deque()
+        self.replay_skipped = set()
 
         if video_path is None and model_path is None:
             self.pose_landmarker = mp.solutions.pose.Pose(
@@ -68,22 +113,107 @@ class JumpForceVelocityTracker:
             )
 
             self.pose_landmarker = mp.tasks.vision.PoseLandmarker.create_from_options(options)
-            self.video_source = VideoSource(self.video_path)
+            self.video_source = VideoSource(analysis_path_for(self.video_path))
 
     def update(self):
-        try:
-            frame = next(self.video_source.stream_bgr())
+        while not self.ready_samples:
+            if not self.pending_frames:
+                try:
+                    frame = next(self.video_source.stream_bgr())
+                except StopIteration:
+                    if self.stream_ended:
+                        return None
+                    self.stream_ended = True
+                    self._flush_filter()
+                    continue
+
+                if frame.idx < self.next_frame_idx:
+                    self._replay(frame)
+                    continue
+
+                self.next_frame_idx = frame.idx + 1
+                if self.motion_gate is None:
+                    self.pending_frames.append(frame)
+                else:
+                    released = self.motion_gate.push(frame, frame.data)
+                    if self.motion_gate.rate_changed:
+                        self.pending_frames.append(None)
+                    self.pending_frames.extend(released)
+                continue
+
+            frame = self.pending_frames.popleft()
+            if frame is None:
+                # The filter assumes evenly spaced samples, so don't let its window straddle a rate change.
+                self._flush_filter()
+                continue
+
             mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=frame.data)
             results = self.pose_landmarker.detect_for_video(mp_image, int(frame.time * 1000))
             landmark_positions_3d = read_landmark_positions_3d(results)
-        except StopIteration:
-            return None
 
-        current_time = frame.time
+            if landmark_positions_3d is None:
+                continue
+
+            self.filter_frames.append(frame.idx)
+            filtered = self.landmark_filter.update(landmark_positions_3d, frame.time)
+            if filtered is not None:
+                self.ready_samples.append((*filtered, self.filter_frames[0]))
+
+        landmark_positions_3d, current_time, frame_idx = self.ready_samples.popleft()
         force, velocity, state = self._compute(landmark_positions_3d, current_time)
-        data_entry = JumpData(force=force, velocity=velocity, jump_state=state, timestamp=current_time)
+        data_entry = JumpData(
+            force=force, velocity=velocity, jump_state=state, timestamp=current_time,
+            frame_idx=frame_idx,
+        )
         return data_entry
 
+    def _flush_filter(self):
+        # The samples still held by the filter's lookahead belong to the most recent frames fed to it.
+        tail = self.landmark_filter.flush()
+        frames = list(self.filter_frames)[len(self.filter_frames) - len(tail):]
+        for (positions, timestamp), frame_idx in zip(tail, frames):
+            self.ready_samples.append((positions, timestamp, frame_idx))
+        self.landmark_filter.reset()
+        self.filter_frames.clear()
+
+    def _replay(self, frame):
+        if frame.idx in self.replay_skipped:
+            self.motion_gate.skipped.append(frame)
+        elif frame.idx in self.replay_frames:
+            while self.replay_frames[0] != frame.idx:
+                self.pending_frames.append(self.replay_frames.popleft())
+            self.replay_frames.popleft()
+            self.pending_frames.append(frame)
+
+    def checkpoint_state(self):
+        return {
+            "previous_position": self.previous_position,
+            "initial_ground": self.initial_ground,
+            "previous_time": self.previous_time,
+            "previous_velocity": self.previous_velocity,
+            "previous_force": self.previous_force,
+            "previous_state": self.previous_state,
+            "landmark_filter": self.landmark_filter,
+            "filter_frames": self.filter_frames,
+            "ready_samples": self.ready_samples,
+            "motion_gate": self.motion_gate,
+            # Frames already read but not yet inferred hold full images; only their indices are kept
+            # and they are re-read after a resume.
+            "replay_frames": [None if frame is None else frame.idx for frame in self.pending_frames],
+            "replay_skipped": [frame.idx for frame in self.motion_gate.skipped] if self.motion_gate else [],
+            "next_frame_idx": self.next_frame_idx,
+        }
+
+    def restore_state(self, state):
+        state = dict(state)
+        self.replay_frames = deque(state.pop("replay_frames"))
+        self.replay_skipped = set(state.pop("replay_skipped"))
+        for name, value in state.items():
+            setattr(self, name, value)
+
+        replayed = [idx for idx in self.replay_frames if idx is not None] + list(self.replay_skipped)
+        self.video_source.seek(min(replayed + [self.next_frame_idx]))
+
     def _compute(self, landmark_positions_3d, current_time):
         current_position = np.mean(landmark_positions_3d[:2, 1])
         ground = np.mean(landmark_positions_3d[2:, 1])
@@ -135,10 +265,23 @@ class JumpForceVelocityTracker:
 
 
 class CameraJumpForceVelocityTracker(JumpForceVelocityTracker):
-    def __init__(self, mass):
-        super().__init__(mass, None, None)
+    def __init__(self, mass, filter_name="one_euro", latency_budget=0.1, motion_gating=True):
+        super().__init__(
+            mass, None, None, filter_name=filter_name, latency_budget=latency_budget, motion_gating=False
+        )
+        # Live frames can't be replayed later, so the camera gate only thins idle frames without pre-roll.
+        self.motion_gate = MotionGate(pre_roll=0) if motion_gating else None
+
+    def update_for_camera(self, frame, timestamp, frame_idx):
+        # frame_idx is the capture's own frame number, so it matches the recording even when frames are skipped here.
+        if self.motion_gate is not None:
+            if not self.motion_gate.push(frame_idx, frame):
+                return None
+            if self.motion_gate.rate_changed:
+                # Live output can't wait for a flush; the few idle samples still buffered are dropped.
+                self.landmark_filter.reset()
+                self.filter_frames.clear()
 
-    def update_for_camera(self, frame, timestamp):
         mp_image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         results = self.pose_landmarker.process(mp_image)
         landmark_positions_3d = camera_read_landmark_positions_3d(results)
@@ -146,5 +289,14 @@ class CameraJumpForceVelocityTracker(JumpForceVelocityTracker):
         if landmark_positions_3d is None:
             return None
 
+        self.filter_frames.append(frame_idx)
+        filtered = self.landmark_filter.update(landmark_positions_3d, timestamp)
+        if filtered is None:
+            return None
+
+        landmark_positions_3d, timestamp = filtered
         force, velocity, state = self._compute(landmark_positions_3d, timestamp)
-        return JumpData(force=force, velocity=velocity, jump_state=state, timestamp=timestamp)
\ No newline at end of file
+        return JumpData(
+            force=force, velocity=velocity, jump_state=state, timestamp=timestamp,
+            frame_idx=self.filter_frames[0],
+        )
\ No newline at end of file
@@ -0,0 +1,251 @@
+from collections import deque
+from typing import List, Optional, Tuple
+
+import numpy as np
+from scipy.signal import savgol_coeffs, savgol_filter
+
+
+class LandmarkFilter:
+    # Number of samples an emitted value lags behind the newest input.
+    lookahead = 0
+
+    def reset(self):
+        pass
+
+    def update(self, positions, timestamp) -> Optional[Tuple[np.ndarray, float]]:
+        raise NotImplementedError
+
+    def flush(self) -> List[Tuple[np.ndarray, float]]:
+        # Emits the samples still held back by the lookahead, e.g. at the end of a video.
+        return []
+
+    def filter_offline(self, positions, timestamps) -> np.ndarray:
+        self.reset()
+        filtered = [self.update(p, t)[0] for p, t in zip(positions, timestamps)]
+        self.reset()
+        return np.array(filtered)
+
+
+class IdentityFilter(LandmarkFilter):
+    def update(self, positions, timestamp):
+        return np.asarray(positions, dtype=float), timestamp
+
+    def filter_offline(self, positions, timestamps):
+        return np.asarray(positions, dtype=float)
+
+
+class OneEuroFilter(LandmarkFilter):
+    # Tuned for MediaPipe's normalized coordinates (speeds around 1 unit/s): beta only opens the cutoff
+    # during real motion, so jitter at rest is smoothed while a jump still tracks within about a frame.
+    def __init__(self, min_cutoff=1.5, beta=5.0, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self):
+        self.previous_value = None
+        self.previous_derivative = None
+        self.previous_time = None
+
+    @staticmethod
+    def _alpha(cutoff, delta_t):
+        tau = 1.0 / (2 * np.pi * cutoff)
+        return 1.0 / (1.0 + tau / delta_t)
+
+    def update(self, positions, timestamp):
+        positions = np.asarray(positions, dtype=float)
+
+        if self.previous_value is None:
+            self.previous_value = positions
+            self.previous_derivative = np.zeros_like(positions)
+            self.previous_time = timestamp
+            return positions, timestamp
+
+        delta_t = timestamp - self.previous_time
+        if delta_t <= 0:
+            return self.previous_value, timestamp
+
+        alpha_d = self._alpha(self.d_cutoff, delta_t)
+        derivative = (positions - self.previous_value) / delta_t
+        derivative = alpha_d * derivative + (1 - alpha_d) * self.previous_derivative
+
+        cutoff = self.min_cutoff + self.beta * np.abs(derivative)
+        alpha = self._alpha(cutoff, delta_t)
+        value = alpha * positions + (1 - alpha) * self.previous_value
+
+        self.previous_value = value
+        self.previous_derivative = derivative
+        self.previous_time = timestamp
+
+        return value, timestamp
+
+
+class SavitzkyGolayFilter(LandmarkFilter):
+    def __init__(self, window_length=9, polyorder=2, lookahead=None):
+        if window_length % 2 == 0 or polyorder >= window_length:
+            raise ValueError("window_length must be odd and greater than polyorder.")
+
+        half = window_length // 2
+        self.window_length = window_length
+        self.polyorder = polyorder
+        self.lookahead = half if lookahead is None else min(max(int(lookahead), 0), half)
+        # Evaluates the fitted polynomial `lookahead` samples behind the newest one.
+        self.coefficients = savgol_coeffs(
+            window_length, polyorder, pos=window_length - 1 - self.lookahead, use='dot'
+        )
+        # tail_coefficients[k] evaluates the fit k samples behind the newest one, for flush().
+        self.tail_coefficients = [
+            savgol_coeffs(window_length, polyorder, pos=window_length - 1 - k, use='dot')
+            for k in range(self.lookahead)
+        ]
+        self.reset()
+
+    def reset(self):
+        self.positions = deque(maxlen=self.window_length)
+        self.timestamps = deque(maxlen=self.window_length)
+
+    def update(self, positions, timestamp):
+        self.positions.append(np.asarray(positions, dtype=float))
+        self.timestamps.append(timestamp)
+
+        if len(self.positions) <= self.lookahead:
+            return None
+
+        emitted_time = self.timestamps[-1 - self.lookahead]
+        if len(self.positions) < self.window_length:
+            return self.positions[-1 - self.lookahead], emitted_time
+
+        return np.tensordot(self.coefficients, np.stack(self.positions), axes=1), emitted_time
+
+    def flush(self):
+        pending = min(self.lookahead, len(self.positions))
+        if len(self.positions) < self.window_length:
+            samples = [(self.positions[-1 - k], self.timestamps[-1 - k]) for k in range(pending - 1, -1, -1)]
+        else:
+            window = np.stack(self.positions)
+            samples = [
+                (np.tensordot(self.tail_coefficients[k], window, axes=1), self.timestamps[-1 - k])
+                for k in range(pending - 1, -1, -1)
+            ]
+        self.reset()
+        return samples
+
+    def filter_offline(self, positions, timestamps):
+        positions = np.asarray(positions, dtype=float)
+        if len(positions) < self.window_length:
+            return positions
+        # No latency constraint offline, so always use the centered (zero-phase) fit.
+        return savgol_filter(positions, self.window_length, self.polyorder, axis=0, mode='interp')
+
+
+class KalmanFilter(LandmarkFilter):
+    def __init__(self, process_noise=1.0, measurement_noise=1e-4):
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        self.reset()
+
+    def reset(self):
+        self.state = None
+        self.covariance = None
+        self.previous_time = None
+
+    def _transition(self, delta_t):
+        transition = np.array([[1.0, delta_t], [0.0, 1.0]])
+        noise = self.process_noise * np.array([
+            [delta_t ** 3 / 3, delta_t ** 2 / 2],
+            [delta_t ** 2 / 2, delta_t],
+        ])
+        return transition, noise
+
+    def _initial(self, positions):
+        state = np.stack([positions, np.zeros_like(positions)], axis=-1)
+        covariance = np.zeros(positions.shape + (2, 2))
+        covariance[..., 0, 0] = self.measurement_noise
+        covariance[..., 1, 1] = 1.0
+        return state, covariance
+
+    def _predict(self, state, covariance, delta_t):
+        transition, noise = self._transition(delta_t)
+        state = state @ transition.T
+        covariance = transition @ covariance @ transition.T + noise
+        return state, covariance
+
+    def _correct(self, state, covariance, positions):
+        innovation = positions - state[..., 0]
+        gain = covariance[..., :, 0] / (covariance[..., 0, 0] + self.measurement_noise)[..., None]
+        state = state + gain * innovation[..., None]
+        covariance = covariance - gain[..., :, None] * covariance[..., None, 0, :]
+        return state, covariance
+
+    def update(self, positions, timestamp):
+        positions = np.asarray(positions, dtype=float)
+
+        if self.state is None:
+            self.state, self.covariance = self._initial(positions)
+            self.previous_time = timestamp
+            return positions, timestamp
+
+        delta_t = timestamp - self.previous_time
+        if delta_t <= 0:
+            return self.state[..., 0], timestamp
+
+        state, covariance = self._predict(self.state, self.covariance, delta_t)
+        self.state, self.covariance = self._correct(state, covariance, positions)
+        self.previous_time = timestamp
+
+        return self.state[..., 0], timestamp
+
+    def filter_offline(self, positions, timestamps):
+        positions = np.asarray(positions, dtype=float)
+        if len(positions) < 2:
+            return positions
+
+        # Forward pass vectorized across landmarks, then a Rauch-Tung-Striebel backward pass.
+        deltas = np.maximum(np.diff(timestamps), 1e-6)
+        filtered_states = np.empty(positions.shape + (2,))
+        filtered_covariances = np.empty(positions.shape + (2, 2))
+        predicted_states = np.empty_like(filtered_states)
+        predicted_covariances = np.empty_like(filtered_covariances)
+
+        state, covariance = self._initial(positions[0])
+        filtered_states[0], filtered_covariances[0] = state, covariance
+        for idx in range(1, len(positions)):
+            state, covariance = self._predict(state, covariance, deltas[idx - 1])
+            predicted_states[idx], predicted_covariances[idx] = state, covariance
+            state, covariance = self._correct(state, covariance, positions[idx])
+            filtered_states[idx], filtered_covariances[idx] = state, covariance
+
+        smoothed = filtered_states.copy()
+        for idx in range(len(positions) - 2, -1, -1):
+            transition, _ = self._transition(deltas[idx])
+            smoother_gain = (
+                filtered_covariances[idx] @ transition.T @ np.linalg.inv(predicted_covariances[idx + 1])
+            )
+            correction = smoothed[idx + 1] - predicted_states[idx + 1]
+            smoothed[idx] = filtered_states[idx] + (smoother_gain @ correction[..., None])[..., 0]
+
+        return smoothed[..., 0]
+
+
+LANDMARK_FILTERS = {
+    "none": IdentityFilter,
+    "one_euro": OneEuroFilter,
+    "savgol": SavitzkyGolayFilter,
+    "kalman": KalmanFilter,
+}
+
+
+def create_landmark_filter(name, latency_budget=None, fps=30.0, **kwargs) -> LandmarkFilter:
+    if name not in LANDMARK_FILTERS:
+        raise ValueError(f"Unknown landmark filter: {name}")
+
+    if latency_budget is not None:
+        if name == "savgol":
+            # Cap the lookahead delay by the latency budget.
+            kwargs.setdefault("lookahead", int(latency_budget * fps))
+        elif name == "one_euro":
+            # The filter's time constant at rest is 1 / (2 * pi * min_cutoff); keep it within the budget.
+            kwargs.setdefault("min_cutoff", 1.0 / (2 * np.pi * latency_budget))
+
+    return LANDMARK_FILTERS[name](**kwargs)
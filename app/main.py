@@ -1,10 +1,18 @@
+import logging
+import os
 import sys
+from datetime import datetime
 
 from PyQt6 import QtWidgets
 
+from analysis_proxy import ProxyIngest
 from camera_plot_window import CameraPlotWindow
 from input_window import InputWindow
+from multi_camera_window import MultiCameraWindow
 from record_plot_window import PlotWindow
+from results import results_path_for
+from results_server import ResultsServer
+from session_catalog import SessionCatalog
 
 
 class MainWindow(QtWidgets.QWidget):
@@ -13,16 +21,48 @@ class MainWindow(QtWidgets.QWidget):
 
         self.input_window = InputWindow()
         self.input_window.start_analysis_signal.connect(self.show_plot_window)
+        self.input_window.start_multi_camera_signal.connect(self.show_multi_camera_window)
+        self.proxy_ingest = ProxyIngest()
+        self.input_window.video_selected_signal.connect(self.proxy_ingest.submit)
         self.plot_window = None
 
+        # The results feed is opt-in: set FV_RESULTS_PORT (0 picks a free port) to serve it.
+        self.results_server = None
+        port = os.environ.get("FV_RESULTS_PORT")
+        if port is not None:
+            results_server = ResultsServer(port=int(port))
+            if results_server.start():
+                logging.info("Results server listening on %s:%s", results_server.host, results_server.port)
+                self.results_server = results_server
+        self.catalog = SessionCatalog()
+
     def show_input_window(self):
         self.input_window.show()
 
-    def show_plot_window(self, mass, video_path, model_path):
-        if video_path == "0":
-            self.plot_window = CameraPlotWindow(mass)
+    def show_plot_window(self, mass, video_path, model_path, record, athlete):
+        if self.results_server is not None:
+            self.results_server.new_session()
+        if video_path.isdigit():
+            session_path = f"../recordings/session_{datetime.now():%Y%m%d_%H%M%S}.avi"
+            os.makedirs(os.path.dirname(session_path), exist_ok=True)
+            self.plot_window = CameraPlotWindow(
+                mass, camera_index=int(video_path), results_server=self.results_server,
+                record_path=session_path if record else None, results_path=results_path_for(session_path),
+                athlete=athlete, catalog=self.catalog,
+            )
         else:
-            self.plot_window = PlotWindow(mass, video_path, model_path)
+            self.plot_window = PlotWindow(
+                mass, video_path, model_path, results_server=self.results_server,
+                athlete=athlete, catalog=self.catalog,
+            )
+        self.plot_window.return_to_main_signal.connect(self.show_input_window)
+        self.plot_window.show()
+        self.input_window.close()
+
+    def show_multi_camera_window(self, streams):
+        if self.results_server is not None:
+            self.results_server.new_session()
+        self.plot_window = MultiCameraWindow(streams, results_server=self.results_server, catalog=self.catalog)
         self.plot_window.return_to_main_signal.connect(self.show_input_window)
         self.plot_window.show()
         self.input_window.close()
@@ -32,7 +72,9 @@ def main():
     app = QtWidgets.QApplication(sys.argv)
     main_window = MainWindow()
     main_window.show_input_window()
-    sys.exit(app.exec())
+    exit_code = app.exec()
+    main_window.proxy_ingest.shutdown()
+    sys.exit(exit_code)
 
 
 if __name__ == "__main__":
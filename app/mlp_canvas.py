@@ -15,8 +15,6 @@ class MplCanvas(FigureCanvas):
         super().__init__(self.fig)
 
     def update_plot(self, data: List[Dict[JumpState, List[JumpData]]], smooth_sigma=2):
-        self.axes.cla()
-
         takeoff_data = {}
         landing_data = {}
 
@@ -35,6 +33,15 @@ class MplCanvas(FigureCanvas):
 
         takeoff_x, takeoff_y = aggregate_data(takeoff_data)
         landing_x, landing_y = aggregate_data(landing_data)
+        self.plot_curves(takeoff_x, takeoff_y, landing_x, landing_y, smooth_sigma)
+
+    def update_plot_from_bins(self, bins, smooth_sigma=2):
+        takeoff_x, takeoff_y = bins.curve(JumpState.TAKEOFF)
+        landing_x, landing_y = bins.curve(JumpState.LANDING)
+        self.plot_curves(takeoff_x, takeoff_y, landing_x, landing_y, smooth_sigma)
+
+    def plot_curves(self, takeoff_x, takeoff_y, landing_x, landing_y, smooth_sigma=2):
+        self.axes.cla()
 
         takeoff_y_smooth = gaussian_filter1d(takeoff_y, sigma=smooth_sigma)
         landing_y_smooth = gaussian_filter1d(landing_y, sigma=smooth_sigma)
@@ -0,0 +1,73 @@
+from collections import deque
+
+import cv2
+import numpy as np
+
+
+class MotionGate:
+    def __init__(self, width=96, lower_fraction=0.5, pixel_threshold=15, motion_fraction=0.01,
+                 idle_stride=6, pre_roll=8, hold=15):
+        self.width = width
+        self.lower_fraction = lower_fraction
+        self.pixel_threshold = pixel_threshold
+        self.motion_fraction = motion_fraction
+        self.idle_stride = idle_stride
+        self.hold = hold
+
+        self.previous = None
+        self.active_frames = 0
+        self.idle_count = 0
+        self.skipped = deque(maxlen=pre_roll)
+        # Set by push() when the released frames switch between every frame and every idle_stride-th one.
+        self.rate_changed = False
+        self.dense = True
+
+    def __getstate__(self):
+        # Skipped frames carry full images; a resumed tracker re-reads them from the video instead.
+        state = self.__dict__.copy()
+        state["skipped"] = deque(maxlen=self.skipped.maxlen)
+        return state
+
+    def _lower_body(self, image):
+        height, width = image.shape[:2]
+        small_height = max(1, int(height * self.width / width))
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        small = cv2.resize(gray, (self.width, small_height), interpolation=cv2.INTER_AREA)
+        return small[int(small_height * (1 - self.lower_fraction)):]
+
+    def is_moving(self, image) -> bool:
+        current = self._lower_body(image)
+        previous, self.previous = self.previous, current
+        if previous is None:
+            return True
+
+        changed = cv2.absdiff(current, previous) > self.pixel_threshold
+        return np.count_nonzero(changed) > self.motion_fraction * changed.size
+
+    def _release(self, items, dense):
+        self.rate_changed = dense != self.dense
+        self.dense = dense
+        return items
+
+    def push(self, item, image):
+        self.rate_changed = False
+        if self.is_moving(image):
+            self.active_frames = self.hold
+        elif self.active_frames > 0:
+            self.active_frames -= 1
+
+        if self.active_frames > 0:
+            # Motion (re)started: hand back the skipped frames right before it so takeoff isn't lost.
+            items = list(self.skipped) + [item]
+            self.skipped.clear()
+            self.idle_count = 0
+            return self._release(items, dense=True)
+
+        self.idle_count += 1
+        if self.idle_count >= self.idle_stride:
+            self.idle_count = 0
+            self.skipped.clear()
+            return self._release([item], dense=False)
+
+        self.skipped.append(item)
+        return []
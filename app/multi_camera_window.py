@@ -0,0 +1,100 @@
+import os
+import sys
+from datetime import datetime
+
+from PyQt6 import QtWidgets, QtCore
+from PyQt6.QtGui import QIcon
+
+from camera_scheduler import CameraScheduler, parse_camera_streams
+
+STATS_COLUMNS = [
+    ("Поток", None),
+    ("Камера", None),
+    ("Спортсмен", None),
+    ("Масса (кг)", None),
+    ("Сегменты", None),
+    ("Кадров захвачено", "captured"),
+    ("Кадров обработано", "processed"),
+    ("Пропущено", "dropped"),
+    ("FPS", "throughput_fps"),
+    ("Задержка ср. (мс)", "mean_latency"),
+    ("Задержка посл. (мс)", "last_latency"),
+]
+
+
+class MultiCameraWindow(QtWidgets.QMainWindow):
+    return_to_main_signal = QtCore.pyqtSignal()
+
+    def __init__(self, streams, workers=None, results_server=None, catalog=None):
+        super().__init__()
+        self.setWindowTitle("Force-Velocity Profiling")
+        self.setGeometry(100, 100, 1000, 400)
+        self.setWindowIcon(QIcon('resources/logo.png'))
+
+        self.central_widget = QtWidgets.QWidget(self)
+        self.setCentralWidget(self.central_widget)
+        self.layout = QtWidgets.QVBoxLayout(self.central_widget)
+
+        self.table = QtWidgets.QTableWidget(len(streams), len(STATS_COLUMNS))
+        self.table.setHorizontalHeaderLabels([title for title, _ in STATS_COLUMNS])
+        self.layout.addWidget(self.table)
+
+        self.return_button = QtWidgets.QPushButton("Вернуться на главный экран")
+        self.return_button.clicked.connect(self.return_to_main)
+        self.layout.addWidget(self.return_button)
+
+        self.catalog = catalog
+        self.session_name = f"../recordings/session_{datetime.now():%Y%m%d_%H%M%S}"
+        on_data = None
+        if results_server is not None:
+            on_data = lambda stream_id, data: results_server.publish(data, stream_id)
+
+        self.scheduler = CameraScheduler(workers=workers, on_data=on_data)
+        for camera_index, mass, athlete in streams:
+            self.scheduler.add_stream(f"camera_{camera_index}", camera_index, mass, athlete)
+        self.scheduler.start()
+
+        self.stats_timer = QtCore.QTimer(self)
+        self.stats_timer.timeout.connect(self.update_stats)
+        self.stats_timer.start(1000)
+
+    def update_stats(self):
+        stats = self.scheduler.stats()
+        for row, stream in enumerate(self.scheduler.streams.values()):
+            report = stats[stream.stream_id]
+            values = [
+                stream.stream_id, stream.camera_index, stream.athlete, f"{stream.mass:g}",
+                len(self.scheduler.segments(stream.stream_id)),
+            ]
+            for _, key in STATS_COLUMNS[len(values):]:
+                value = report[key]
+                if key == "throughput_fps":
+                    value = f"{value:.1f}"
+                elif key.endswith("latency"):
+                    value = f"{value * 1000:.0f}"
+                values.append(value)
+
+            for column, value in enumerate(values):
+                self.table.setItem(row, column, QtWidgets.QTableWidgetItem(str(value)))
+
+    def return_to_main(self):
+        self.stats_timer.stop()
+        self.scheduler.stop()
+
+        os.makedirs(os.path.dirname(self.session_name), exist_ok=True)
+        for stream in self.scheduler.streams.values():
+            stream.save(f"{self.session_name}_{stream.stream_id}.results.pkl", self.catalog)
+        self.close()
+        self.return_to_main_signal.emit()
+
+
+def main():
+    app = QtWidgets.QApplication(sys.argv)
+    window = MultiCameraWindow(parse_camera_streams(",".join(sys.argv[1:])))
+    window.return_to_main_signal.connect(app.quit)
+    window.show()
+    sys.exit(app.exec())
+
+
+if __name__ == "__main__":
+    main()
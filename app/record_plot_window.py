@@ -2,17 +2,27 @@ import cv2
 from PyQt6 import QtWidgets, QtCore
 from PyQt6.QtGui import QImage, QPixmap, QIcon
 
-from jump_tracker import JumpForceVelocityTracker, JumpData, JumpState
+from analysis_proxy import analysis_path_for
+from checkpoint import dump_checkpoint, load_checkpoint, remove_checkpoint, write_checkpoint_async
+from jump_index import JumpIndexBuilder
+from jump_tracker import JumpForceVelocityTracker, JumpData, JumpState, JumpSegmenter
+from fv_profile import ForceVelocityProfile
+from results import save_session
+from session_store import ProfileBins, SessionStore
 from tracking_worker import TrackingWorker
 from mlp_canvas import MplCanvas
 from video_source import VideoSource
 
 
+def segment_end_time(segment):
+    return max(data.timestamp for phase in segment.values() for data in phase[-1:])
+
+
 class PlotWindow(QtWidgets.QMainWindow):
     update_video_signal = QtCore.pyqtSignal(QPixmap)
     return_to_main_signal = QtCore.pyqtSignal()
 
-    def __init__(self, mass, video_path, model_path):
+    def __init__(self, mass, video_path, model_path, results_server=None, athlete="", catalog=None):
         super().__init__()
         self.setWindowTitle("Force-Velocity Profiling")
         self.setFixedSize(1280, 720)
@@ -44,42 +54,81 @@ class PlotWindow(QtWidgets.QMainWindow):
         central_widget.setLayout(self.main_layout)
         self.setCentralWidget(central_widget)
 
+        self.video_path = video_path
+        self.mass = mass
+        self.athlete = athlete
+        self.catalog = catalog
         self.tracker = JumpForceVelocityTracker(mass, video_path, model_path)
-        self.worker = TrackingWorker(self.tracker)
+        self.worker = TrackingWorker(self.tracker, results_server)
         self.worker.data_ready.connect(self.on_new_data)
         self.worker.status_update.connect(self.update_status)
         self.worker.finished.connect(self.on_processing_finished)
+        self.worker.checkpoint_ready.connect(self.on_checkpoint)
 
-        self.segments = []
-        self.current_segment = {JumpState.TAKEOFF: [], JumpState.LANDING: []}
-        self.skip_next = False
         self.plot_updated = False
-
-        self.video_source = VideoSource(video_path)
+        self.checkpoint_thread = None
+        self.results_saved = False
+        self.playback_segments = None
+        self.next_playback_segment = None
+        self.playback_bins = ProfileBins()
+
+        checkpoint = load_checkpoint(video_path)
+        if checkpoint is not None:
+            self.tracker.restore_state(checkpoint["tracker"])
+            self.segmenter, self.jump_index_builder, self.profile = checkpoint["results"]
+            self.status_label.setText(f"Статус: Продолжение с кадра {checkpoint['frame_idx']}...")
+        else:
+            self.segmenter = JumpSegmenter(SessionStore(spill_path=f"{video_path}.segments.log"))
+            self.jump_index_builder = JumpIndexBuilder()
+            self.profile = ForceVelocityProfile()
+        self.store = self.segmenter.segments
+
+        self.video_source = VideoSource(analysis_path_for(video_path))
         self.video_timer = QtCore.QTimer(self)
         self.video_timer.timeout.connect(self.update_video_and_plot)
 
         self.worker.start()
 
     def on_new_data(self, data: JumpData):
-        if data.jump_state == JumpState.TRANSITION:
-            if self.current_segment[JumpState.TAKEOFF] or self.current_segment[JumpState.LANDING]:
-                self.segments.append(self.current_segment)
-                self.current_segment = {JumpState.TAKEOFF: [], JumpState.LANDING: []}
-            self.skip_next = True
-            return
+        self.jump_index_builder.add(data)
+        if self.segmenter.add(data):
+            self.profile.add(data, len(self.segmenter.segments))
+
+    def on_checkpoint(self, tracker_state):
+        # Serialized here so the snapshot matches the results handled so far; the disk write is off-thread.
+        payload = dump_checkpoint(
+            self.video_path,
+            tracker_state["next_frame_idx"],
+            tracker_state,
+            (self.segmenter, self.jump_index_builder, self.profile),
+        )
+        if self.checkpoint_thread is not None:
+            self.checkpoint_thread.join()
+        self.checkpoint_thread = write_checkpoint_async(self.video_path, payload)
 
-        if self.skip_next:
-            self.skip_next = False
+    def on_processing_finished(self):
+        if not self.worker.running:
             return
 
-        if data.jump_state == JumpState.TAKEOFF:
-            self.current_segment[JumpState.TAKEOFF].append(data)
-        elif data.jump_state == JumpState.LANDING:
-            self.current_segment[JumpState.LANDING].append(data)
-
-    def on_processing_finished(self):
-        self.status_label.setText("Обработка завершена. Начало синхронного воспроизведения.")
+        current_segment = self.segmenter.current_segment
+        if current_segment[JumpState.TAKEOFF] or current_segment[JumpState.LANDING]:
+            self.store.append(current_segment)
+        jump_index = self.jump_index_builder.index
+        save_session(
+            self.video_path, self.store, jump_index, self.profile, self.athlete, self.mass, self.catalog
+        )
+        self.results_saved = True
+        if self.checkpoint_thread is not None:
+            self.checkpoint_thread.join()
+        remove_checkpoint(self.video_path)
+
+        # Segments are time-ordered, so playback streams them from the store instead of refiltering a list.
+        self.playback_segments = iter(self.store)
+        self.next_playback_segment = next(self.playback_segments, None)
+
+        self.status_label.setText(
+            f"Обработка завершена ({len(jump_index)} прыжков). Начало синхронного воспроизведения."
+        )
         self.video_timer.start(30)  # 30 FPS
 
     def update_video_and_plot(self):
@@ -108,11 +157,13 @@ class PlotWindow(QtWidgets.QMainWindow):
             current_frame_idx = frame.idx
             current_frame_time = frame.time
             if current_frame_idx % 5 == 0:
-                segments = [
-                    segment for segment in self.segments
-                    if segment[JumpState.LANDING][-1].timestamp < current_frame_time
-                ]
-                self.canvas.update_plot(segments)
+                while (
+                    self.next_playback_segment is not None
+                    and segment_end_time(self.next_playback_segment) < current_frame_time
+                ):
+                    self.playback_bins.add_segment(self.next_playback_segment)
+                    self.next_playback_segment = next(self.playback_segments, None)
+                self.canvas.update_plot_from_bins(self.playback_bins)
         except StopIteration:
             self.video_timer.stop()
             self.status_label.setText("Воспроизведение завершено.")
@@ -120,6 +171,7 @@ class PlotWindow(QtWidgets.QMainWindow):
     def return_to_main(self):
         self.video_source.close()
         self.worker.stop()
+        self.store.close(delete=self.results_saved)
         self.close()
         self.return_to_main_signal.emit()
 
@@ -0,0 +1,48 @@
+import pickle
+from typing import Dict, Iterable, List, Tuple
+
+from fv_profile import ForceVelocityProfile
+from jump_index import JumpIndex
+from jump_tracker import JumpData, JumpState
+
+
+def save_results(path, segments: Iterable[Dict[JumpState, List[JumpData]]], jump_index: JumpIndex):
+    # A header followed by one pickle per segment, so a spilled session is written without loading it whole.
+    with open(path, 'wb') as file:
+        pickle.dump({"jump_index": jump_index}, file)
+        for segment in segments:
+            pickle.dump(segment, file)
+
+
+def load_results(path) -> Tuple[List[Dict[JumpState, List[JumpData]]], JumpIndex]:
+    with open(path, 'rb') as file:
+        results = pickle.load(file)
+
+        # Older result files hold only the list of segments, or a dict with all of them.
+        if isinstance(results, list):
+            return results, JumpIndex()
+        if "segments" in results:
+            return results["segments"], results.get("jump_index") or JumpIndex()
+
+        segments = []
+        while True:
+            try:
+                segments.append(pickle.load(file))
+            except EOFError:
+                break
+    return segments, results["jump_index"]
+
+
+def results_path_for(video_path):
+    return f"{video_path}.results.pkl"
+
+
+def save_session(video_path, segments: Iterable[Dict[JumpState, List[JumpData]]], jump_index: JumpIndex,
+                 profile: ForceVelocityProfile, athlete, mass, catalog=None, results_path=None):
+    # Raw samples stay in the results file; the catalogue only keeps aggregates pointing at it.
+    if results_path is None:
+        results_path = results_path_for(video_path)
+    save_results(results_path, segments, jump_index)
+    if catalog is not None:
+        catalog.add_session(athlete, mass, video_path, results_path, jump_index, profile)
+    return results_path
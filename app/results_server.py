@@ -0,0 +1,192 @@
+import asyncio
+import json
+import logging
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+
+from jump_tracker import JumpData, JumpSegmenter, JumpState
+
+
+def jump_data_to_dict(data: JumpData):
+    return {
+        "force": float(data.force),
+        "velocity": float(data.velocity),
+        "state": data.jump_state.name,
+        "timestamp": float(data.timestamp),
+        "frame_idx": int(data.frame_idx),
+    }
+
+
+def segment_to_dict(index, segment: Dict[JumpState, List[JumpData]], stream=None):
+    return {
+        "type": "segment",
+        **stream_fields(stream),
+        "index": index,
+        "takeoff": [jump_data_to_dict(data) for data in segment[JumpState.TAKEOFF]],
+        "landing": [jump_data_to_dict(data) for data in segment[JumpState.LANDING]],
+    }
+
+
+def stream_fields(stream):
+    # Single-camera sessions keep the original message shape; multi-camera ones tag every message.
+    return {} if stream is None else {"stream": stream}
+
+
+def encode(message):
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode()
+
+
+class ClientConnection:
+    def __init__(self, writer: asyncio.StreamWriter, max_queue):
+        self.writer = writer
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        self.dropped = 0
+
+    def offer(self, message: bytes):
+        # A slow client loses its oldest messages instead of stalling everyone else.
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(message)
+
+
+class ReplayWindow:
+    # Keeps only the newest completed segments for late joiners, so all-day sessions stay bounded;
+    # count still numbers every segment of the session.
+    def __init__(self, size):
+        self.segments = deque(maxlen=size)
+        self.count = 0
+
+    def append(self, segment):
+        self.segments.append(segment)
+        self.count += 1
+
+    def __iter__(self):
+        return enumerate(self.segments, start=self.count - len(self.segments))
+
+
+class ResultsServer:
+    def __init__(self, host="127.0.0.1", port=8765, max_queue=1024, batch_size=64, batch_interval=0.05,
+                 replay_segments=50):
+        self.host = host
+        self.port = port
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.replay_segments = replay_segments
+
+        self.segmenters: Dict[Optional[str], JumpSegmenter] = {}
+        self.clients: List[ClientConnection] = []
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.thread: Optional[threading.Thread] = None
+        self.started = threading.Event()
+
+    def start(self) -> bool:
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        self.started.wait()
+        return self.loop is not None
+
+    def stop(self):
+        if self.loop is None:
+            return
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop = None
+
+    def publish(self, data: JumpData, stream=None):
+        # Called from the inference thread; hand off to the event loop without waiting.
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self._dispatch, data, stream)
+
+    def new_session(self):
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self._start_session)
+
+    def _run(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            self.server = loop.run_until_complete(
+                asyncio.start_server(self._handle_client, self.host, self.port)
+            )
+            self.port = self.server.sockets[0].getsockname()[1]
+            self.loop = loop
+        except OSError as e:
+            # Port taken or not bindable: run without the server instead of blocking start().
+            logging.error("Couldn't start results server on %s:%s: %s", self.host, self.port, e)
+            loop.close()
+            return
+        finally:
+            self.started.set()
+
+        try:
+            self.loop.run_forever()
+        finally:
+            self.server.close()
+            tasks = asyncio.all_tasks(self.loop)
+            for task in tasks:
+                task.cancel()
+            self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            self.loop.run_until_complete(self.server.wait_closed())
+            self.loop.close()
+
+    def _start_session(self):
+        self.segmenters = {}
+        for client in self.clients:
+            client.offer(encode({"type": "session_started"}))
+
+    def _dispatch(self, data: JumpData, stream=None):
+        if stream not in self.segmenters:
+            self.segmenters[stream] = JumpSegmenter(ReplayWindow(self.replay_segments))
+        segmenter = self.segmenters[stream]
+        completed = segmenter.segments.count
+        segmenter.add(data)
+
+        messages = [encode({"type": "sample", **stream_fields(stream), **jump_data_to_dict(data)})]
+        if segmenter.segments.count > completed:
+            messages.append(encode({"type": "segment_completed", **stream_fields(stream), "index": completed}))
+
+        for client in self.clients:
+            for message in messages:
+                client.offer(message)
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        client = ClientConnection(writer, self.max_queue)
+
+        # Late joiners first receive the most recent completed segments, then the live stream.
+        replay = [
+            segment_to_dict(idx, segment, stream)
+            for stream, segmenter in self.segmenters.items()
+            for idx, segment in segmenter.segments
+        ]
+        self.clients.append(client)
+        try:
+            for message in replay:
+                writer.write(encode(message))
+            await writer.drain()
+            await self._send_batches(client)
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.clients.remove(client)
+            writer.close()
+            if client.dropped:
+                logging.warning("Results client dropped %d messages", client.dropped)
+
+    async def _send_batches(self, client: ClientConnection):
+        while True:
+            batch = [await client.queue.get()]
+            try:
+                await asyncio.wait_for(self._fill_batch(client, batch), self.batch_interval)
+            except asyncio.TimeoutError:
+                pass
+
+            client.writer.write(b"".join(batch))
+            await client.writer.drain()
+
+    async def _fill_batch(self, client: ClientConnection, batch):
+        while len(batch) < self.batch_size:
+            batch.append(await client.queue.get())
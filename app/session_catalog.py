@@ -0,0 +1,157 @@
+import hashlib
+import os
+import sqlite3
+import time
+from typing import List, Optional
+
+from fv_profile import ForceVelocityProfile
+from jump_index import JumpIndex
+from jump_tracker import JumpState
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    athlete TEXT NOT NULL,
+    mass REAL NOT NULL,
+    recorded_at REAL NOT NULL,
+    video_path TEXT NOT NULL,
+    video_hash TEXT NOT NULL,
+    results_path TEXT NOT NULL,
+    jumps INTEGER NOT NULL,
+    mean_flight_time REAL,
+    best_flight_time REAL,
+    peak_force REAL,
+    peak_velocity REAL,
+    takeoff_f0 REAL,
+    takeoff_v0 REAL,
+    takeoff_slope REAL,
+    takeoff_pmax REAL,
+    landing_f0 REAL,
+    landing_v0 REAL,
+    landing_slope REAL,
+    landing_pmax REAL
+);
+CREATE INDEX IF NOT EXISTS sessions_athlete_date ON sessions (athlete, recorded_at);
+CREATE INDEX IF NOT EXISTS sessions_video_hash ON sessions (video_hash);
+
+CREATE TABLE IF NOT EXISTS jumps (
+    session_id INTEGER NOT NULL REFERENCES sessions (id) ON DELETE CASCADE,
+    number INTEGER NOT NULL,
+    start_frame INTEGER NOT NULL,
+    end_frame INTEGER NOT NULL,
+    takeoff_time REAL NOT NULL,
+    landing_time REAL NOT NULL,
+    flight_time REAL NOT NULL,
+    peak_force REAL NOT NULL,
+    peak_velocity REAL NOT NULL,
+    PRIMARY KEY (session_id, number)
+);
+"""
+
+# Run once per catalogue, tracked with PRAGMA user_version.
+MIGRATIONS = [
+    # Catalogues created before sessions were unique per results file may hold repeated analyses;
+    # keep only the latest of each.
+    """
+    DELETE FROM sessions WHERE id NOT IN (SELECT MAX(id) FROM sessions GROUP BY results_path);
+    CREATE UNIQUE INDEX IF NOT EXISTS sessions_results_path ON sessions (results_path);
+    """,
+]
+
+HASH_CHUNK = 1 << 20
+
+
+def video_hash(path):
+    # Size plus the first, middle and last MiB: cheap to compute on multi-GB files and enough to tell them apart.
+    size = os.path.getsize(path)
+    digest = hashlib.sha256(str(size).encode())
+    with open(path, 'rb') as file:
+        for offset in (0, max(0, size // 2 - HASH_CHUNK // 2), max(0, size - HASH_CHUNK)):
+            file.seek(offset)
+            digest.update(file.read(HASH_CHUNK))
+    return digest.hexdigest()
+
+
+class SessionCatalog:
+    def __init__(self, path="../sessions.db"):
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.executescript(SCHEMA)
+
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+            self.connection.executescript(f"BEGIN; {migration} PRAGMA user_version = {number}; COMMIT;")
+
+    def close(self):
+        self.connection.close()
+
+    def add_session(self, athlete, mass, video_path, results_path, jump_index: JumpIndex,
+                    profile: ForceVelocityProfile, recorded_at=None) -> int:
+        # Live sessions that weren't recorded have no video to point at.
+        if recorded_at is None:
+            recorded_at = os.path.getmtime(video_path) if video_path else time.time()
+        summary = jump_index.summary()
+
+        fits = {}
+        for state in (JumpState.TAKEOFF, JumpState.LANDING):
+            fit = profile.fit(state)
+            prefix = state.name.lower()
+            fits[f"{prefix}_f0"] = fit.f0 if fit else None
+            fits[f"{prefix}_v0"] = fit.v0 if fit else None
+            fits[f"{prefix}_slope"] = fit.slope if fit else None
+            fits[f"{prefix}_pmax"] = fit.pmax if fit else None
+
+        row = {
+            "athlete": athlete,
+            "mass": mass,
+            "recorded_at": recorded_at,
+            "video_path": os.path.abspath(video_path) if video_path else "",
+            "video_hash": video_hash(video_path) if video_path else "",
+            "results_path": os.path.abspath(results_path),
+            "jumps": summary["jumps"],
+            "mean_flight_time": summary.get("mean_flight_time"),
+            "best_flight_time": summary.get("best_flight_time"),
+            "peak_force": summary.get("peak_force"),
+            "peak_velocity": summary.get("peak_velocity"),
+            **fits,
+        }
+
+        # Re-analysing a video rewrites its results file, so the session for that file is replaced, not repeated.
+        updates = ", ".join(f"{column} = excluded.{column}" for column in row if column != "results_path")
+        with self.connection:
+            session_id = self.connection.execute(
+                f"INSERT INTO sessions ({', '.join(row)}) VALUES ({', '.join('?' * len(row))}) "
+                f"ON CONFLICT (results_path) DO UPDATE SET {updates} RETURNING id",
+                list(row.values()),
+            ).fetchone()[0]
+            self.connection.execute("DELETE FROM jumps WHERE session_id = ?", (session_id,))
+            self.connection.executemany(
+                "INSERT INTO jumps VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        session_id, r.number, r.start_frame, r.end_frame, r.takeoff_time,
+                        r.landing_time, r.flight_time, r.peak_force, r.peak_velocity,
+                    )
+                    for r in jump_index.records
+                ],
+            )
+        return session_id
+
+    def sessions_for(self, athlete, days: Optional[float] = None) -> List[sqlite3.Row]:
+        since = time.time() - days * 86400 if days is not None else 0
+        return self.connection.execute(
+            "SELECT * FROM sessions WHERE athlete = ? AND recorded_at >= ? ORDER BY recorded_at",
+            (athlete, since),
+        ).fetchall()
+
+    def sessions_for_video(self, path) -> List[sqlite3.Row]:
+        return self.connection.execute(
+            "SELECT * FROM sessions WHERE video_hash = ? ORDER BY recorded_at", (video_hash(path),)
+        ).fetchall()
+
+    def jumps_for(self, session_id) -> List[sqlite3.Row]:
+        return self.connection.execute(
+            "SELECT * FROM jumps WHERE session_id = ? ORDER BY number", (session_id,)
+        ).fetchall()
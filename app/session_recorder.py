@@ -0,0 +1,56 @@
+import logging
+import os
+import queue
+import threading
+
+import cv2
+
+from video_source import timestamps_path_for
+
+
+class SessionRecorder:
+    def __init__(self, path, fourcc="MJPG", fps=30.0):
+        self.path = path
+        self.fourcc = fourcc
+        self.fps = fps
+        self.written = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Unbounded on purpose: the capture side only enqueues, and no frame may be dropped.
+        self.frames = queue.Queue()
+        self.writer = threading.Thread(target=self._write_loop, daemon=True)
+        self.writer.start()
+
+    def write(self, frame, timestamp):
+        self.frames.put((frame, timestamp))
+
+    def close(self):
+        self.frames.put(None)
+        self.writer.join()
+
+    def _write_loop(self):
+        video_writer = None
+        with open(timestamps_path_for(self.path), 'w') as timestamps:
+            while True:
+                item = self.frames.get()
+                if item is None:
+                    break
+
+                frame, timestamp = item
+                if video_writer is None:
+                    height, width = frame.shape[:2]
+                    video_writer = cv2.VideoWriter(
+                        self.path, cv2.VideoWriter_fourcc(*self.fourcc), self.fps, (width, height)
+                    )
+                    if not video_writer.isOpened():
+                        logging.error("Couldn't open video writer at %s", self.path)
+
+                video_writer.write(frame)
+                timestamps.write(f"{timestamp!r}\n")
+                self.written += 1
+
+        if video_writer is not None:
+            video_writer.release()
@@ -0,0 +1,134 @@
+import os
+import pickle
+import queue
+import tempfile
+import threading
+from collections import deque
+from typing import Dict, List
+
+import numpy as np
+
+from jump_tracker import JumpData, JumpState
+
+
+class ProfileBins:
+    def __init__(self, bin_width=0.01):
+        self.bin_width = bin_width
+        # Per phase: velocity bin -> [force sum, sample count].
+        self.bins = {JumpState.TAKEOFF: {}, JumpState.LANDING: {}}
+
+    def add_segment(self, segment: Dict[JumpState, List[JumpData]]):
+        for state, phase_bins in self.bins.items():
+            for data in segment.get(state, []):
+                key = round(data.velocity / self.bin_width)
+                entry = phase_bins.setdefault(key, [0.0, 0])
+                entry[0] += data.force
+                entry[1] += 1
+
+    def curve(self, state: JumpState):
+        phase_bins = self.bins[state]
+        keys = sorted(phase_bins)
+        x = np.array([key * self.bin_width for key in keys])
+        y = np.array([phase_bins[key][0] / phase_bins[key][1] for key in keys])
+        return x, y
+
+
+class SessionStore:
+    def __init__(self, spill_path=None, window=20):
+        # Without a caller-chosen path the log is a private temp file, removed again on close().
+        self.temporary = spill_path is None
+        if self.temporary:
+            descriptor, spill_path = tempfile.mkstemp(prefix="fv_session_", suffix=".log")
+            os.close(descriptor)
+        self.spill_path = spill_path
+        self.window = window
+
+        self.recent = deque()
+        self.bins = ProfileBins()
+        self.count = 0
+        self.spilled_count = 0
+        self.spilled_bytes = 0
+        # Segments handed to the writer but not yet on disk; guarded by lock together with the spill counters.
+        self.pending = deque()
+        self._start_writer(truncate=True)
+
+    def _start_writer(self, truncate):
+        self.lock = threading.Lock()
+        self.spill_queue = queue.Queue()
+        self.spill_file = open(self.spill_path, 'wb' if truncate else 'r+b')
+        self.spill_file.seek(self.spilled_bytes)
+        self.spill_file.truncate()
+        self.writer = threading.Thread(target=self._write_loop, daemon=True)
+        self.writer.start()
+        for segment in self.pending:
+            self.spill_queue.put(segment)
+
+    def _write_loop(self):
+        while True:
+            segment = self.spill_queue.get()
+            if segment is None:
+                self.spill_queue.task_done()
+                break
+            pickle.dump(segment, self.spill_file)
+            self.spill_file.flush()
+            with self.lock:
+                self.spilled_bytes = self.spill_file.tell()
+                self.spilled_count += 1
+                self.pending.popleft()
+            self.spill_queue.task_done()
+
+    def append(self, segment: Dict[JumpState, List[JumpData]]):
+        self.bins.add_segment(segment)
+        self.recent.append(segment)
+        self.count += 1
+        # Evicted segments are pickled on the writer thread so the caller never waits on disk.
+        while len(self.recent) > self.window:
+            segment = self.recent.popleft()
+            with self.lock:
+                self.pending.append(segment)
+            self.spill_queue.put(segment)
+
+    def flush(self):
+        self.spill_queue.join()
+
+    def close(self, delete=False):
+        self.spill_queue.put(None)
+        self.writer.join()
+        self.spill_file.close()
+        if (delete or self.temporary) and os.path.exists(self.spill_path):
+            os.remove(self.spill_path)
+
+    def _snapshot(self):
+        # What is on disk plus what is still queued; taken without waiting for the writer.
+        with self.lock:
+            return self.spilled_count, self.spilled_bytes, list(self.pending)
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        spilled_count, _, pending = self._snapshot()
+        recent = list(self.recent)
+
+        def segments():
+            with open(self.spill_path, 'rb') as file:
+                for _ in range(spilled_count):
+                    yield pickle.load(file)
+            yield from pending
+            yield from recent
+
+        return segments()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for name in ("lock", "spill_queue", "spill_file", "writer"):
+            del state[name]
+        state["spilled_count"], state["spilled_bytes"], pending = self._snapshot()
+        state["pending"] = deque(pending)
+        state["recent"] = deque(self.recent)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # Drop anything spilled after this snapshot was taken, then rewrite what was still pending.
+        self._start_writer(truncate=False)
@@ -1,3 +1,6 @@
+import copy
+import time
+
 from PyQt6.QtCore import QThread, pyqtSignal
 
 from jump_tracker import JumpData
@@ -6,22 +9,33 @@ from jump_tracker import JumpData
 class TrackingWorker(QThread):
     data_ready = pyqtSignal(JumpData)
     status_update = pyqtSignal(str)
+    checkpoint_ready = pyqtSignal(object)
     finished = pyqtSignal()
 
-    def __init__(self, tracker):
+    def __init__(self, tracker, results_server=None, checkpoint_interval=30.0):
         super().__init__()
         self.tracker = tracker
+        self.results_server = results_server
+        self.checkpoint_interval = checkpoint_interval
         self.running = True
 
     def run(self):
+        last_checkpoint = time.monotonic()
         while self.running:
             data = self.tracker.update()
             if data:
                 self.data_ready.emit(data)
+                if self.results_server is not None:
+                    self.results_server.publish(data)
                 self.status_update.emit("Обработка данных...")
             else:
                 break
 
+            # Queued after every data_ready emitted so far, so the receiver's results match this state.
+            if time.monotonic() - last_checkpoint >= self.checkpoint_interval:
+                self.checkpoint_ready.emit(copy.deepcopy(self.tracker.checkpoint_state()))
+                last_checkpoint = time.monotonic()
+
         self.status_update.emit("Обработка завершена")
         self.finished.emit()
 
@@ -1,6 +1,7 @@
 import logging
+import os
 from dataclasses import dataclass
-from typing import Iterator
+from typing import Iterator, List, Optional
 
 import cv2
 
@@ -12,18 +13,36 @@ class VideoFrame:
     idx: int
 
 
+def timestamps_path_for(path: str) -> str:
+    return f"{path}.timestamps"
+
+
+def read_timestamps(path: str) -> Optional[List[float]]:
+    # Recorded camera sessions keep their capture timestamps in a sidecar next to the video.
+    timestamps_path = timestamps_path_for(path)
+    if not os.path.exists(timestamps_path):
+        return None
+    with open(timestamps_path) as file:
+        return [float(line) for line in file if line.strip()]
+
+
 class VideoSource:
     def __init__(self, path: str):
-        if path == "0":
-            self.capture = cv2.VideoCapture(0)
+        self.timestamps = None
+        if path.isdigit():
+            self.capture = cv2.VideoCapture(int(path))
         else:
             self.capture = cv2.VideoCapture(path)
+            self.timestamps = read_timestamps(path)
         if not self.capture.isOpened():
             logging.error("Couldn't open video at %s", path)
 
     def close(self) -> None:
         self.capture.release()
 
+    def seek(self, frame_idx: int) -> None:
+        self.capture.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+
     def stream_bgr(self) -> Iterator[VideoFrame]:
         while self.capture.isOpened():
             idx = int(self.capture.get(cv2.CAP_PROP_POS_FRAMES))
@@ -33,4 +52,7 @@ class VideoSource:
             if not is_open:
                 break
 
-            yield VideoFrame(data=bgr, time=time_ms * 1e-3, idx=idx)
+            if self.timestamps is not None and idx < len(self.timestamps):
+                yield VideoFrame(data=bgr, time=self.timestamps[idx], idx=idx)
+            else:
+                yield VideoFrame(data=bgr, time=time_ms * 1e-3, idx=idx)